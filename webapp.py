@@ -18,16 +18,35 @@ Notes:
 - PyMuPDF (pip install pymupdf) extracts text robustly. For complex PDFs with heavy layout, extraction may be imperfect.
 - This is a minimal proof-of-concept single-file app. For production, add file size limits, authentication, HTTPS, and storage cleanup.
 """
-from flask import Flask, request, redirect, url_for, render_template_string, send_from_directory, flash
+from flask import Flask, Response, abort, request, redirect, url_for, send_from_directory, flash, stream_with_context
 import fitz  # PyMuPDF
+import functools
+import gzip
+import hashlib
+import io
+import json
+import math
 import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from werkzeug.utils import secure_filename
 
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None  # optional fast path; PyMuPDF remains the fallback
+
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf'}
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
 
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+# Werkzeug aborts oversized bodies during the streaming read, before
+# anything is written to disk or parsed.
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES
 app.secret_key = 'replace_this_with_a_secure_random_key'
 
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -53,10 +72,12 @@ TEMPLATE = r"""
     .viewer{flex:1;max-width:900px}
     .text-area{padding:1rem;border-radius:8px;box-shadow:0 2px 10px rgba(0,0,0,0.03);min-height:60vh;overflow:auto}
     .word {white-space:pre-wrap}
+    .para {white-space:pre-wrap;margin:0 0 1em}
     .bionic-strong{font-weight:700}
     label{display:block;margin-top:0.75rem}
     input[type=range]{width:100%}
     .muted{color:#6b7280;font-size:0.9rem}
+    .flash{background:#fef2f2;color:#b91c1c;padding:.5rem 1rem;border-bottom:1px solid #fecaca}
     .file-list{font-size:0.9rem}
     footer{padding:1rem;border-top:1px solid #eee;text-align:center;color:#6b7280}
   </style>
@@ -66,6 +87,11 @@ TEMPLATE = r"""
     <h2>Bionic Reader — PDF to Fast Text</h2>
     <div class="muted">Upload a PDF, then toggle Bionic Reading & Soft Text</div>
   </header>
+  {% with messages = get_flashed_messages() %}
+  {% if messages %}
+  <div class="flash">{% for m in messages %}<div>{{ m }}</div>{% endfor %}</div>
+  {% endif %}
+  {% endwith %}
   <main>
     <aside class="controls">
       <form id="uploadForm" method="post" enctype="multipart/form-data" action="/upload">
@@ -105,28 +131,154 @@ TEMPLATE = r"""
 
 <script>
 // Utilities
-function escapeHtml(s){
-  return s.replace(/&/g,'&amp;').replace(/</g,'&lt;').replace(/>/g,'&gt;')
-           .replace(/"/g,'&quot;').replace(/'/g,'&#039;');
+// Compiled once at module scope; text arrival re-splits with this rather
+// than constructing a regex per call.
+const PARA_SPLIT = /\n{2,}/;
+
+// Bionic algorithm: bold the first ceil(len * ratio) characters of each word.
+// One forward scan over the raw string — no regex passes. Characters are
+// classified via charCodeAt: ASCII letters/digits/apostrophe are word
+// chars; non-ASCII counts as a word char unless it is Unicode whitespace
+// or punctuation (NBSP, Latin-1 punctuation and symbols — guillemets,
+// middle dot, section sign, ×, ÷ — general punctuation — dashes, curly
+// quotes, ellipsis, zero-width spaces — supplemental and CJK
+// punctuation), so an em-dash or a guillemet never gets bolded as a
+// "word".
+// Mirrors the server-side word class; keep the copy in TOKEN_WORKER_SRC
+// below in sync.
+function isWordCode(cc){
+  if(cc < 128)
+    return (cc >= 48 && cc <= 57) || (cc >= 65 && cc <= 90) ||
+           (cc >= 97 && cc <= 122) || cc === 39;
+  return !(cc === 0xA0 || (cc >= 0xA1 && cc <= 0xBF) ||
+           cc === 0xD7 || cc === 0xF7 || cc === 0x1680 ||
+           (cc >= 0x2000 && cc <= 0x206F) ||
+           (cc >= 0x2E00 && cc <= 0x2E7F) ||
+           (cc >= 0x3000 && cc <= 0x303F));
+}
+// Append word spans and text nodes for one paragraph directly to a DOM
+// parent: textContent escapes natively in the browser, and no HTML
+// string is built for the parser to re-scan. Each word's bold span and
+// tail text node are recorded so intensity changes can move the bold
+// boundary in place without rebuilding any nodes.
+function bionicAppendWords(parent, text, ratio, words){
+  const n = text.length;
+  let i = 0;
+  while(i < n){
+    if(!isWordCode(text.charCodeAt(i))){
+      let j = i + 1;
+      while(j < n && !isWordCode(text.charCodeAt(j))) j++;
+      parent.appendChild(document.createTextNode(text.slice(i, j)));
+      i = j;
+      continue;
+    }
+    let j = i + 1;
+    while(j < n && isWordCode(text.charCodeAt(j))) j++;
+    const word = text.slice(i, j);
+    const k = Math.max(1, Math.ceil(word.length * ratio));
+    const w = document.createElement('span');
+    w.className = 'word';
+    const b = document.createElement('span');
+    b.className = 'bionic-strong';
+    b.textContent = word.slice(0, k);
+    const tail = document.createTextNode(word.slice(k));
+    w.appendChild(b);
+    w.appendChild(tail);
+    parent.appendChild(w);
+    words.push({b: b, tail: tail, word: word});
+    i = j;
+  }
+}
+
+// Same DOM construction, but from word offsets the tokenizer worker
+// already computed — no per-character scan on the main thread. `flat`
+// is the document-wide Uint32Array of (start,end) pairs; [lo,hi) is
+// this paragraph's slice of it, in array elements.
+function appendWordsFromOffsets(parent, text, flat, lo, hi, ratio, words){
+  let pos = 0;
+  for(let t = lo; t < hi; t += 2){
+    const i = flat[t], j = flat[t+1];
+    if(i > pos) parent.appendChild(document.createTextNode(text.slice(pos, i)));
+    const word = text.slice(i, j);
+    const k = Math.max(1, Math.ceil(word.length * ratio));
+    const w = document.createElement('span');
+    w.className = 'word';
+    const b = document.createElement('span');
+    b.className = 'bionic-strong';
+    b.textContent = word.slice(0, k);
+    const tail = document.createTextNode(word.slice(k));
+    w.appendChild(b);
+    w.appendChild(tail);
+    parent.appendChild(w);
+    words.push({b: b, tail: tail, word: word});
+    pos = j;
+  }
+  if(pos < text.length) parent.appendChild(document.createTextNode(text.slice(pos)));
+}
+
+// Tokenization is the only whole-document compute left; run it in a
+// worker once the text has arrived so a big document never janks the UI
+// thread. The worker posts back one flat Uint32Array of word
+// (start,end) pairs for the whole document plus a per-paragraph index
+// into it — two cache-friendly typed arrays instead of millions of JS
+// objects — and both buffers are transferred, not copied. Bold extents
+// are not stored: k = ceil(len * ratio) is integer math at render time.
+// Until the offsets arrive, window rebuilds fall back to the
+// synchronous scan.
+const TOKEN_WORKER_SRC = `
+// Keep in sync with the main-thread isWordCode above.
+function isWordCode(cc){
+  if(cc < 128)
+    return (cc >= 48 && cc <= 57) || (cc >= 65 && cc <= 90) ||
+           (cc >= 97 && cc <= 122) || cc === 39;
+  return !(cc === 0xA0 || (cc >= 0xA1 && cc <= 0xBF) ||
+           cc === 0xD7 || cc === 0xF7 || cc === 0x1680 ||
+           (cc >= 0x2000 && cc <= 0x206F) ||
+           (cc >= 0x2E00 && cc <= 0x2E7F) ||
+           (cc >= 0x3000 && cc <= 0x303F));
+}
+onmessage = (e) => {
+  const paras = e.data;
+  const out = [];
+  const paraStart = new Uint32Array(paras.length + 1);
+  for(let p = 0; p < paras.length; p++){
+    paraStart[p] = out.length;
+    const text = paras[p];
+    const n = text.length;
+    let i = 0;
+    while(i < n){
+      if(!isWordCode(text.charCodeAt(i))){ i++; continue; }
+      let j = i + 1;
+      while(j < n && isWordCode(text.charCodeAt(j))) j++;
+      out.push(i, j);
+      i = j;
+    }
+  }
+  paraStart[paras.length] = out.length;
+  const flat = Uint32Array.from(out);
+  postMessage({flat: flat, paraStart: paraStart}, [flat.buffer, paraStart.buffer]);
+};
+`;
+
+function tokenizeInWorker(){
+  const w = new Worker(URL.createObjectURL(new Blob([TOKEN_WORKER_SRC], {type: 'text/javascript'})));
+  w.onmessage = (e)=>{
+    w.terminate();
+    VIEW.tokens = e.data;
+  };
+  w.postMessage(VIEW.paras);
 }
 
-// Bionic algorithm: bold the first ceil(len * ratio) characters of each word
-function bionicWrapText(text, ratioPercent){
-  const ratio = Math.min(Math.max(ratioPercent/100, 0.05), 0.9);
-  // Split keeping whitespace
-  return text.split(/(\s+)/).map(token => {
-    if (/^\s+$/.test(token)) return token;
-    // For punctuation-heavy tokens, separate letters
-    const m = token.match(/^([\p{L}\p{N}']+)(.*)$/u);
-    if (!m) return escapeHtml(token);
-    const core = m[1];
-    const rest = m[2] || '';
-    const n = core.length;
-    const k = Math.max(1, Math.ceil(n * ratio));
-    const first = escapeHtml(core.slice(0,k));
-    const last = escapeHtml(core.slice(k));
-    return `<span class="word"><span class="bionic-strong">${first}</span>${last}${escapeHtml(rest)}</span>`;
-  }).join('');
+// Intensity-only updates: the word boundaries never move, so just slide
+// characters between each word's bold span and its tail text node.
+function updateBoldExtent(ratio){
+  const words = VIEW.words;
+  for(let i = 0; i < words.length; i++){
+    const rec = words[i];
+    const k = Math.max(1, Math.ceil(rec.word.length * ratio));
+    rec.b.textContent = rec.word.slice(0, k);
+    rec.tail.data = rec.word.slice(k);
+  }
 }
 
 function applyStyles(){
@@ -157,56 +309,440 @@ function updateLineHeightLabel(){
   document.getElementById('lineHeightLabel').innerText = (lineHeightPx / 16).toFixed(2);
 }
 
+// Virtualized rendering: only ~3 viewport heights of paragraphs are in
+// the DOM at any time; spacer divs above and below preserve the
+// scrollbar extent, and the window is recomputed on scroll. Paragraph
+// height is a running estimate refined after each real layout.
+const VIEW = {paras: [], avgH: 24, first: -1, last: -1, words: [], tokens: null};
+
+function renderWindow(intensity, force){
+  const c = document.getElementById('textContainer');
+  const paras = VIEW.paras;
+  const n = paras.length;
+  if(!n){ c.textContent = 'Upload a PDF to extract text here.'; return; }
+  const vh = c.clientHeight || 600;
+  const first = Math.max(0, Math.floor((c.scrollTop - vh) / VIEW.avgH));
+  const last = Math.min(n, Math.ceil((c.scrollTop + 2*vh) / VIEW.avgH));
+  if(!force && first === VIEW.first && last === VIEW.last) return;
+  const ratio = Math.min(Math.max(intensity/100, 0.05), 0.9);
+  const frag = document.createDocumentFragment();
+  const top = document.createElement('div');
+  top.style.height = Math.round(first*VIEW.avgH) + 'px';
+  frag.appendChild(top);
+  VIEW.words = [];
+  for(let p = first; p < last; p++){
+    const el = document.createElement('p');
+    el.className = 'para';
+    if(VIEW.tokens){
+      appendWordsFromOffsets(el, paras[p], VIEW.tokens.flat,
+                             VIEW.tokens.paraStart[p], VIEW.tokens.paraStart[p+1],
+                             ratio, VIEW.words);
+    } else {
+      bionicAppendWords(el, paras[p], ratio, VIEW.words);
+    }
+    frag.appendChild(el);
+  }
+  const bottom = document.createElement('div');
+  bottom.style.height = Math.round((n-last)*VIEW.avgH) + 'px';
+  frag.appendChild(bottom);
+  c.replaceChildren(frag);
+  VIEW.first = first; VIEW.last = last;
+  // Refine the per-paragraph height estimate from what was laid out.
+  const spacers = (first + (n - last)) * VIEW.avgH;
+  const rendered = c.scrollHeight - spacers;
+  if(last > first && rendered > 0){
+    VIEW.avgH = VIEW.avgH*0.7 + (rendered/(last-first))*0.3;
+  }
+}
+
 // Take raw text in data-raw attribute and render bionic-wrapped HTML
 function renderText(){
-  const raw = window._pdfRawText || '';
   const intensity = parseInt(document.getElementById('bionicIntensity').value,10);
   document.getElementById('bionicLabel').innerText = intensity + '%';
-  const html = bionicWrapText(escapeHtml(raw), intensity);
-  document.getElementById('textContainer').innerHTML = html;
+  // Prefer server-precomputed HTML (small documents only): snap to the
+  // nearest 5% bucket and swap prebuilt strings. Buckets are fetched on
+  // demand and memoized; misses fall through to the client renderer
+  // while the fetch is in flight.
+  const cache = window._serverBuckets;
+  if(cache && window._fileId){
+    const bucket = Math.min(60, Math.max(10, Math.round(intensity/5)*5));
+    const html = cache[bucket];
+    if(html !== undefined){
+      document.getElementById('textContainer').innerHTML = html;
+      VIEW.first = VIEW.last = -1;  // the windowed DOM is gone
+      VIEW.words = [];
+      applyStyles();
+      return;
+    }
+    if(!cache['pending' + bucket]){
+      cache['pending' + bucket] = true;
+      fetch('/bionic/' + window._fileId + '/' + bucket)
+        .then(r => r.ok ? r.text() : null)
+        .then(h => {
+          if(h === null){ window._serverBuckets = null; return; }
+          cache[bucket] = h;
+          const cur = parseInt(document.getElementById('bionicIntensity').value,10);
+          if(Math.min(60, Math.max(10, Math.round(cur/5)*5)) === bucket) renderText();
+        });
+    }
+  }
+  if(VIEW.words.length && VIEW.first >= 0){
+    // Window already rendered: slide the bold boundaries in place.
+    updateBoldExtent(Math.min(Math.max(intensity/100, 0.05), 0.9));
+  } else {
+    renderWindow(intensity, true);
+  }
   applyStyles();
 }
 
-// Controls
+// Range inputs fire on every pixel of drag; coalesce bursts so at most
+// one render runs per animation frame.
+function rafThrottle(fn){
+  let pending = false;
+  return ()=>{
+    if(pending) return;
+    pending = true;
+    requestAnimationFrame(()=>{ pending = false; fn(); });
+  };
+}
+const scheduleRender = rafThrottle(renderText);
+const scheduleStyles = rafThrottle(applyStyles);
+const scheduleScroll = rafThrottle(()=>{
+  if(VIEW.paras.length && !window._serverBuckets){
+    renderWindow(parseInt(document.getElementById('bionicIntensity').value,10), false);
+  }
+});
+
+// Controls. Only the intensity slider needs the text re-rendered; the
+// style controls just mutate CSS on the container.
 ['fontSize','lineHeight','bionicIntensity','softToggle'].forEach(id=>{
   const el = document.getElementById(id);
   if(!el) return;
-  el.addEventListener('input', ()=>{
+  el.addEventListener('input', id === 'bionicIntensity' ? scheduleRender : scheduleStyles);
+});
+
+// Stream extracted text from the server: pages arrive as SSE messages
+// and are appended to the paragraph list as they come, so the first
+// page paints without waiting for the whole PDF.
+function appendText(txt){
+  VIEW.paras.push(...txt.split(PARA_SPLIT));
+  VIEW.tokens = null;  // offsets are per final paragraph list
+  renderWindow(parseInt(document.getElementById('bionicIntensity').value,10), true);
+}
+
+function startExtractionStream(fileId){
+  const es = new EventSource('/extract/' + fileId);
+  const parts = [];
+  es.onmessage = (e)=>{
+    const txt = JSON.parse(e.data);
+    if(txt){
+      parts.push(txt);
+      appendText(txt);
+    }
+  };
+  es.addEventListener('done', (e)=>{
+    es.close();
+    window._pdfRawText = parts.join('\n\n');
+    const info = JSON.parse(e.data);
+    if(info && info.buckets) window._serverBuckets = {};
+    tokenizeInWorker();
     renderText();
   });
-});
+  // A mid-stream drop must be visible: the server discards the pending
+  // upload when the stream closes, so EventSource auto-reconnect would
+  // only 404 and the user would be left with a silently truncated
+  // document. The notice goes outside #textContainer, which renderWindow
+  // rebuilds on every scroll.
+  es.onerror = ()=>{
+    es.close();
+    const c = document.getElementById('textContainer');
+    let note = document.getElementById('streamError');
+    if(!note){
+      note = document.createElement('div');
+      note.id = 'streamError';
+      note.className = 'flash';
+      c.insertAdjacentElement('beforebegin', note);
+    }
+    note.textContent = '[stream interrupted — re-upload the file to retry]';
+  };
+}
 
-// When page loads, if server embedded text is present, wire it
+// Cached path: the text was extracted on a previous upload of this same
+// PDF, so fetch it in one gzip request instead of streaming. The fetch
+// and gunzip+decode run inside a worker (DecompressionStream +
+// TextDecoderStream), so the main thread never blocks on megabytes of
+// decode; text chunks are posted back as they decompress.
+const DECODE_WORKER_SRC = `
+onmessage = async (e) => {
+  const resp = await fetch(e.data);
+  const reader = resp.body
+    .pipeThrough(new DecompressionStream('gzip'))
+    .pipeThrough(new TextDecoderStream())
+    .getReader();
+  for(;;){
+    const {value, done} = await reader.read();
+    if(done) break;
+    postMessage({chunk: value});
+  }
+  postMessage({done: true});
+};
+`;
+
+function loadCachedText(fileId){
+  const w = new Worker(URL.createObjectURL(new Blob([DECODE_WORKER_SRC], {type: 'text/javascript'})));
+  const parts = [];
+  w.onmessage = (e)=>{
+    if(e.data.done){
+      w.terminate();
+      const raw = parts.join('');
+      window._pdfRawText = raw;
+      VIEW.paras = raw ? raw.split(PARA_SPLIT) : [];
+      VIEW.first = VIEW.last = -1;
+      VIEW.words = [];
+      VIEW.tokens = null;
+      // Enable server buckets optimistically; the first fetch 404s and
+      // disables them if this document is too large for precompute.
+      window._serverBuckets = {};
+      tokenizeInWorker();
+      renderText();
+      return;
+    }
+    parts.push(e.data.chunk);
+  };
+  // Blob workers resolve relative URLs against the blob, not the page.
+  w.postMessage(new URL('/text/' + fileId, location.origin).href);
+}
+
+// When page loads, if the server rendered file metadata, start streaming
 window.addEventListener('DOMContentLoaded', ()=>{
-  const embedded = document.getElementById('embeddedRaw');
-  if(embedded){
-    window._pdfRawText = embedded.textContent || '';
-    const fname = embedded.getAttribute('data-fname') || 'Uploaded PDF';
-    document.getElementById('uploadedName').innerText = fname;
-    renderText();
+  const meta = document.getElementById('fileMeta');
+  if(meta){
+    const info = JSON.parse(meta.textContent);
+    window._fileId = info.fileId;
+    document.getElementById('uploadedName').innerText = info.filename || 'Uploaded PDF';
+    if(info.cached){
+      loadCachedText(info.fileId);
+    } else {
+      startExtractionStream(info.fileId);
+    }
   }
+  document.getElementById('textContainer').addEventListener('scroll', scheduleScroll);
 });
 </script>
 
-<!-- Server may render raw text into this element (hidden) to avoid extra fetch -->
-{% if raw_text %}
-<pre id="embeddedRaw" data-fname="{{ filename }}" style="display:none">{{ raw_text }}</pre>
+<!-- Server renders upload metadata here; text itself streams in via SSE -->
+{% if file_id %}
+<script id="fileMeta" type="application/json">{{ {'fileId': file_id, 'filename': filename, 'cached': cached}|tojson }}</script>
 {% endif %}
 
 </body>
 </html>
 """
 
+# Compile the template once at import time; render_template_string would
+# re-parse the whole thing on every request.
+_TEMPLATE = app.jinja_env.from_string(TEMPLATE)
+
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+
+def _iter_pages_pdfium(data):
+    """Per-page plain text via pdfium's get_text_range (no layout pass)."""
+    pdf = pdfium.PdfDocument(data)
+    try:
+        for i in range(len(pdf)):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            txt = textpage.get_text_range()
+            textpage.close()
+            page.close()
+            yield txt
+    finally:
+        pdf.close()
+
+
+def _iter_pages_fitz(data):
+    """Per-page text via PyMuPDF, extracted in parallel: MuPDF releases
+    the GIL inside get_text, so a thread pool scales with cores. ex.map
+    yields results in page order."""
+    doc = fitz.open(stream=data, filetype='pdf')
+
+    def page_text(i):
+        return doc.load_page(i).get_text("text")
+
+    n = doc.page_count
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+        yield from ex.map(page_text, range(n))
+
+
+def iter_page_texts(data):
+    """Per-page raw text from in-memory PDF bytes, for streaming to the
+    client.
+
+    We only need plain text (no layout/structure), so prefer pdfium's
+    cheaper get_text_range path when installed; the caller handles the
+    whole-document fallback to PyMuPDF for PDFs that extract empty."""
+    if pdfium is not None:
+        return _iter_pages_pdfium(data)
+    return _iter_pages_fitz(data)
+
+
+# Intensity buckets precomputed per upload so slider moves swap prebuilt
+# HTML instead of re-tokenizing the whole document per event.
+BIONIC_BUCKETS = tuple(range(10, 61, 5))
+
+# Full-document HTML per bucket is only worth shipping for small texts;
+# anything larger renders client-side through the virtualized window.
+BUCKET_PRECOMPUTE_MAX_CHARS = 200_000
+
+# Word runs for the server renderer: letters/digits/apostrophe, no
+# underscore, and none of the Latin-1 letter-like oddities (ªºµ¹²³)
+# the client's code-point ranges exclude — kept in line with the
+# client's isWordCode so server buckets and the client window bold the
+# same glyphs. Every run in a hyphenated or slashed token is a word of
+# its own, exactly as the client scan sees it.
+_WORD_RUN = re.compile(r"(?:[^\W_ªºµ¹²³]|')+")
+_PARA_SPLIT = re.compile(r'\n{2,}')
+
+# Single-pass HTML escape: str.translate sweeps the string once in C,
+# where html.escape chains five full-string str.replace passes. Same
+# entities as html.escape(quote=True).
+_HTML_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;',
+                               '"': '&quot;', "'": '&#x27;'})
+
+
+def _escape(s):
+    return s.translate(_HTML_ESCAPES)
+
+def _txt_path(file_id):
+    return os.path.join(app.config['UPLOAD_FOLDER'], file_id + '.txt')
+
+
+@functools.lru_cache(maxsize=8)
+def _get_raw(file_id):
+    """Raw text for an upload, read from the uploads/<id>.txt cache.
+
+    The LRU keeps only the hottest few documents in memory; everything
+    else stays on disk rather than accumulating full extracted texts in
+    the process for its lifetime. Entries are immutable (content-hash
+    keyed), so cached reads never go stale."""
+    with open(_txt_path(file_id), encoding='utf-8') as f:
+        return f.read()
+
+
+def bionic_wrap_text(text, ratio_percent):
+    """Server-side mirror of the client renderer: bold the first
+    ceil(len * ratio) characters of each word.
+
+    Paragraphs get the same `.para` blocks the client window renderer
+    produces (which carry white-space:pre-wrap), so swapping a server
+    bucket in does not change the document's layout."""
+    ratio = min(max(ratio_percent / 100, 0.05), 0.9)
+    out = []
+    for para in _PARA_SPLIT.split(text):
+        out.append('<p class="para">')
+        pos = 0
+        for m in _WORD_RUN.finditer(para):
+            if m.start() > pos:
+                out.append(_escape(para[pos:m.start()]))
+            core = m.group(0)
+            k = max(1, math.ceil(len(core) * ratio))
+            out.append('<span class="word"><span class="bionic-strong">%s</span>%s</span>'
+                       % (_escape(core[:k]), _escape(core[k:])))
+            pos = m.end()
+        if pos < len(para):
+            out.append(_escape(para[pos:]))
+        out.append('</p>')
+    return ''.join(out)
+
+
+@functools.lru_cache(maxsize=128)
+def render_bionic(file_id, bucket):
+    """Bionic HTML for one (file, intensity bucket), memoized across
+    repeat uploads of the same content."""
+    return bionic_wrap_text(_get_raw(file_id), bucket)
+
+
+def _buckets_path(file_id):
+    return os.path.join(app.config['UPLOAD_FOLDER'], file_id + '.buckets.json.gz')
+
+
+def _precompute_buckets(file_id, raw):
+    """Render every intensity bucket in parallel worker processes and
+    persist the map gzipped, so later slider moves are pure lookups.
+
+    Runs in a background thread after extraction; the user is already
+    reading the first client-rendered window by then."""
+    with ProcessPoolExecutor() as ex:
+        rendered = ex.map(functools.partial(bionic_wrap_text, raw), BIONIC_BUCKETS)
+        buckets = dict(zip(BIONIC_BUCKETS, rendered))
+    with gzip.open(_buckets_path(file_id), 'wt', encoding='utf-8') as f:
+        json.dump(buckets, f)
+
+_FILE_ID_RE = re.compile(r'[0-9a-f]{64}\Z')
+
+# Uploaded PDF bytes awaiting extraction, keyed by content hash. Held in
+# memory only and dropped once the text lands in the disk cache; the PDF
+# itself is never written out. An upload whose EventSource never opens
+# would otherwise park its bytes here forever, so entries expire after
+# _PENDING_TTL_SECONDS and the map is capped at _PENDING_MAX_BYTES
+# total, evicting oldest-first (dict insertion order) on insert.
+_PENDING_PDFS = {}  # file_id -> (data, monotonic deadline)
+_PENDING_LOCK = threading.Lock()
+_PENDING_TTL_SECONDS = 600
+_PENDING_MAX_BYTES = 4 * MAX_UPLOAD_BYTES
+
+
+def _store_pending(file_id, data):
+    now = time.monotonic()
+    with _PENDING_LOCK:
+        expired = [k for k, (_, deadline) in _PENDING_PDFS.items()
+                   if deadline <= now]
+        for k in expired:
+            del _PENDING_PDFS[k]
+        _PENDING_PDFS.pop(file_id, None)
+        total = sum(len(d) for d, _ in _PENDING_PDFS.values()) + len(data)
+        while total > _PENDING_MAX_BYTES and _PENDING_PDFS:
+            oldest = next(iter(_PENDING_PDFS))
+            dropped, _ = _PENDING_PDFS.pop(oldest)
+            total -= len(dropped)
+        _PENDING_PDFS[file_id] = (data, now + _PENDING_TTL_SECONDS)
+
+
+def _get_pending(file_id):
+    with _PENDING_LOCK:
+        entry = _PENDING_PDFS.get(file_id)
+        if entry is None:
+            return None
+        data, deadline = entry
+        if deadline <= time.monotonic():
+            del _PENDING_PDFS[file_id]
+            return None
+        return data
+
+
+def _drop_pending(file_id):
+    with _PENDING_LOCK:
+        _PENDING_PDFS.pop(file_id, None)
+
+
 @app.route('/', methods=['GET'])
 def index():
-    return render_template_string(TEMPLATE, raw_text=None, filename='')
+    return _TEMPLATE.render(file_id=None, filename='', cached=False)
+
+
+@app.errorhandler(413)
+def upload_too_large(e):
+    flash(f'File too large (limit is {MAX_UPLOAD_BYTES // (1024 * 1024)} MB)')
+    return redirect(url_for('index'))
 
 @app.route('/upload', methods=['POST'])
 def upload_file():
+    # Cheap early reject for clients that declare an oversize body.
+    if request.content_length is not None and request.content_length > MAX_UPLOAD_BYTES:
+        abort(413)
     if 'file' not in request.files:
         flash('No file part')
         return redirect(url_for('index'))
@@ -216,23 +752,123 @@ def upload_file():
         return redirect(url_for('index'))
     if file and allowed_file(file.filename):
         fname = secure_filename(file.filename)
-        path = os.path.join(app.config['UPLOAD_FOLDER'], fname)
-        file.save(path)
-        # Extract text with PyMuPDF
-        try:
-            doc = fitz.open(path)
-            all_text = []
-            for page in doc:
-                txt = page.get_text("text")
-                if txt:
-                    all_text.append(txt)
-            raw = "\n\n".join(all_text)
-        except Exception as e:
-            raw = f"[Error extracting text: {e}]"
-        return render_template_string(TEMPLATE, raw_text=raw, filename=fname)
+        # Read the (size-capped) upload straight into memory: both
+        # extractors parse from bytes, so the PDF never round-trips
+        # through the filesystem.
+        data = file.read()
+        file_id = hashlib.sha256(data).hexdigest()
+        # Respond immediately. If this exact PDF was extracted before,
+        # the client fetches the cached text in one request; otherwise
+        # it opens an EventSource on /extract/<id> and text streams in
+        # page by page.
+        cached = os.path.exists(_txt_path(file_id))
+        if not cached:
+            _store_pending(file_id, data)
+        return _TEMPLATE.render(file_id=file_id, filename=fname, cached=cached)
     else:
         flash('Invalid file type')
         return redirect(url_for('index'))
 
+
+@app.route('/extract/<file_id>')
+def extract_stream(file_id):
+    """Stream per-page extracted text as Server-Sent Events.
+
+    Each page is one `data:` event (JSON string); a final `done` event
+    carries the precomputed bucket map (or null for large documents).
+    Streaming means time-to-first-text is one page, not the whole PDF."""
+    if not _FILE_ID_RE.match(file_id):
+        abort(404)
+    data = _get_pending(file_id)
+    if data is None:
+        abort(404)
+
+    def stream(pages, buf):
+        for txt in pages:
+            if txt:
+                if buf.tell():
+                    buf.write("\n\n")
+                buf.write(txt)
+                yield 'data: %s\n\n' % json.dumps(txt)
+
+    def gen():
+        buf = io.StringIO()
+        try:
+            try:
+                yield from stream(iter_page_texts(data), buf)
+                if not buf.getvalue().strip() and pdfium is not None:
+                    # pdfium extracted nothing (empty/scrambled); retry
+                    # with PyMuPDF before giving up.
+                    buf = io.StringIO()
+                    yield from stream(_iter_pages_fitz(data), buf)
+            except Exception as e:
+                # Nothing is cached on failure: persisting the partial
+                # buffer would pin empty or truncated text to this
+                # content hash and every re-upload would silently serve
+                # it. Report the error and let a retry re-extract.
+                yield 'data: %s\n\n' % json.dumps(f"[Error extracting text: {e}]")
+                yield 'event: done\ndata: %s\n\n' % json.dumps({'buckets': False})
+                return
+            raw = buf.getvalue()
+            with open(_txt_path(file_id), 'w', encoding='utf-8') as f:
+                f.write(raw)
+            has_buckets = bool(raw) and len(raw) <= BUCKET_PRECOMPUTE_MAX_CHARS
+            if has_buckets and not os.path.exists(_buckets_path(file_id)):
+                threading.Thread(target=_precompute_buckets, args=(file_id, raw),
+                                 daemon=True).start()
+            yield 'event: done\ndata: %s\n\n' % json.dumps({'buckets': has_buckets})
+        finally:
+            # Also runs on GeneratorExit: when the client disconnects
+            # mid-stream the WSGI server closes the generator, and the
+            # pending PDF bytes (up to 50 MB) must not outlive it.
+            _drop_pending(file_id)
+
+    return Response(stream_with_context(gen()), mimetype='text/event-stream')
+
+
+@app.route('/text/<file_id>')
+def text_payload(file_id):
+    """Serve cached extracted text gzip-compressed.
+
+    Keeping the text out of the rendered page avoids Jinja escaping
+    megabytes of it per request and halves what the browser holds; gzip
+    cuts the wire size roughly 5x for natural text. Sent as opaque bytes
+    (no Content-Encoding) so the client worker controls decompression
+    and the decode never runs on the browser's main thread."""
+    if not _FILE_ID_RE.match(file_id):
+        abort(404)
+    try:
+        raw = _get_raw(file_id)
+    except FileNotFoundError:
+        abort(404)
+    return Response(gzip.compress(raw.encode('utf-8')),
+                    mimetype='application/octet-stream')
+
+
+@app.route('/bionic/<file_id>/<int:bucket>')
+def bionic_bucket(file_id, bucket):
+    """One precomputed bionic HTML bucket, fetched on demand.
+
+    Served from the gzipped map the precompute workers persisted;
+    render_bionic fills in (and memoizes) any bucket requested before
+    the background precompute finishes. Large documents 404 here and
+    render client-side instead."""
+    if not _FILE_ID_RE.match(file_id) or bucket not in BIONIC_BUCKETS:
+        abort(404)
+    try:
+        raw = _get_raw(file_id)
+    except FileNotFoundError:
+        abort(404)
+    if len(raw) > BUCKET_PRECOMPUTE_MAX_CHARS:
+        abort(404)
+    path = _buckets_path(file_id)
+    if os.path.exists(path):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            buckets = json.load(f)
+        cached = buckets.get(str(bucket))
+        if cached is not None:
+            return Response(cached, mimetype='text/html')
+    return Response(render_bionic(file_id, bucket), mimetype='text/html')
+
 if __name__ == '__main__':
-    app.run(debug=True)
+    app.run()